@@ -3,17 +3,94 @@
 Created on Mon Mar  7 12:07:27 2022, @author: Simon, @version: 1.0
 """
 
+import re
+import io
+import sys
+import bisect
+import reprlib
+import gzip
+import lzma
+import numbers
+import fnmatch
+import itertools
 import numpy as np
 import copy
+import pickle
+import hashlib
 import pandas as pd
+import os
 import json
 import h5py
+import warnings
+import weakref
 from fractions import Fraction
 from decimal import Decimal
 from mpmath import mpf,mpc
+from serialization_as_dict import encode_array,decode_array
 
 convertible_types = (dict,pd.Series,pd.DataFrame,h5py._hl.files.File,
                      h5py._hl.group.Group,h5py._hl.dataset.Dataset)
+json_openers = {'json':open,'json.gz':gzip.open,'json.xz':lzma.open}
+
+summary = reprlib.Repr()
+summary.maxlist = summary.maxtuple = summary.maxset = summary.maxdict = 20
+summary.maxlevel,summary.maxstring,summary.maxother = 3,200,200
+
+class H5Dataset:
+    """
+Proxy leaf standing for an h5py.Dataset in a lazily loaded DataDict: nothing 
+is read from the file before the first access to the values.
+    >>> d = DataDict(filepath.h5,lazy=True)
+    >>> d.images.absorption.data[100:200] # reads only the requested slice
+    >>> np.asarray(d.images.absorption.data) # reads (and caches) everything
+A (deep) copy is another proxy of the same dataset, read from the file kept
+open by the original DataDict; pickling reads the values (unpickled as an 
+array).
+    """
+    
+    def __init__(self,dataset):
+        self.dataset = dataset
+        self.shape,self.dtype = dataset.shape,dataset.dtype
+        self.cache = None
+        
+    @property
+    def ndim(self):
+        return len(self.shape)
+    
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+        
+    def __len__(self):
+        return self.shape[0]
+    
+    def read(self):
+        if self.cache is None:
+            self.cache = self.dataset[()]
+        return self.cache
+    
+    def __getitem__(self,index):
+        if self.cache is not None:
+            return self.cache[index]
+        return self.dataset[index]
+    
+    def __array__(self,dtype=None,copy=None):
+        array = self.read()
+        if dtype is not None:
+            return array.astype(dtype,copy=bool(copy))
+        return array.copy() if copy else array
+    
+    def __deepcopy__(self,memo):
+        res = H5Dataset(self.dataset)
+        if self.cache is not None:
+            res.cache = self.cache.copy()
+        return res
+    
+    def __reduce__(self):
+        return (np.asarray,(self.read(),))
+    
+    def __repr__(self):
+        return f'<H5Dataset {self.dataset.name} {self.shape} {self.dtype}>'
 
 class DataDict(dict):
     """
@@ -24,75 +101,279 @@ INDENTED STRING REPRESENTATION (with d = DataDict(a_nested_dictionary))
     >>> print(d)
     >>> d.print_keys() # to show the keys only
     >>> d.print_types() # to show the type and shape of the values
+    >>> d.print_keys(max_chars=5000,max_depth=2) # to limit the output 
 
 PARALLEL ACCESS TO THE KEYS AS ATTRIBUTES (enabling autocompletion in iPython)
     >>> d['key1']['key1a']
     >>> d.key1.key1a        # only for keys that are of type str
+                            # (see also CompactDataDict, lighter in memory)
     >>> d.get('key1.key1a') # "keypath" (dot-separated chain of keys) accepted
+    >>> d.get_many(['key1.key1a','key2']) # several keypaths at once
 
 CONVERSION TO A DICT, recursively, of several kinds of objects (pd.Series, 
 h5py.File…) and files (.json, .h5…)
     >>> d = DataDict(object)
     >>> d = DataDict(filepath.extension)
+    >>> d = DataDict.from_dataframe(df) # one array per column
+    >>> d = DataDict(filepath,select=['globals.Dimple','images.*.attrs'])
+                                # (glob patterns accepted; for .h5 files, 
+                                #  nothing else is opened or read)
+    >>> d = DataDict(filepath.h5,lazy=True) # datasets read on first access
+    >>> d.close() # or "with DataDict(filepath.h5,lazy=True) as d: ..."
+    >>> d = DataDict(filepath.h5,memmap=True) # contiguous datasets mapped 
+                                              # read-only from the file
 
 CONVERSION FROM A DICT to several kinds of objects and files
-    >>> obj = d.to_json_serializable() / …
+    >>> obj = d.to_json_serializable() / d.to_dataframe() / …
     >>> d.save(filepath.extension)
+    >>> d.save(filepath.h5,compression='gzip') # chunked, compressed datasets
+    >>> d.save(filepath.json,arrays='base64') # or 'npy': raw array buffers
+    >>> d.save(filepath.json.gz) # or .json.xz: compressed on the fly
+    >>> d.save(filepath.h5) # if loaded from this very file, only rewrites 
+                            # what changed since loaded (or last saved)
 
 EXTENSION OF THE DICT METHODS
     .merge(other_dict): variant of the update method, that works recursively
          for nested dicts (and prevents overwriting in case of key collision).
          
+    DataDict.merge_all(list_of_dicts): merges them all at once, and returns 
+         the merged DataDict with a report of the conflicting keypaths.
+         
     .rename({old_key:new_key}): returns a copy of the dict, with new_keys 
          being substituted to old_keys.
          
 	.select(list_of_keys): returns the corresponding portion of the dictionary 
              (here as well, "keypaths" are supported as keys).
              
-	.search(key): returns a list of all "keypaths" leading to the searched key.
+	.digest() / .diff(other_dict): content hash of the tree / keypaths added, 
+             removed or changed from the dict to other_dict.
+             
+	.search(key): returns a list of all "keypaths" leading to the searched key
+             (mode='substring','prefix','glob' or 'regex' for broader queries).
     
 	.get_above/below(test_key): returns the value correponding to the closest 
-             key that is above or below the test_key (in alphabetical order).
+             key that is above or below the test_key (in alphabetical order, 
+             or numerical order for numbers; test_key can also be an array).
 
 N.B.: the pop method also supports a "keypath" argument; 
-      the copy method returns a deep copy of the dict.
+      the copy method returns a deep copy of the dict, or with cow=True a 
+      copy of the tree structure that shares its arrays with the original, 
+      as read-only views (to modify the copy: d.key = new_array); the 
+      original is left untouched, so that its arrays, if modified in 
+      place, are modified in the copy as well.
     """
     
-    def __init__(self,arg=None):
+    # internal state in slots, off the instance dict (which is not even 
+    # created for the nodes of a CompactDataDict): __parents__ (see __link__),
+    # __dirty__ (keys changed since loaded or saved), __cache__ (indexes and 
+    # digests, rebuilt lazily after mutations, not pickled)
+    __slots__ = ('__dict__','__weakref__','__parents__','__dirty__','__cache__')
+    repr_max_chars = 20000 # budget of the string representation (or None)
+    __compact__ = False # see CompactDataDict
+    
+    def __new__(cls,*args,**kwargs):
+        self = super().__new__(cls)
+        for name in ['__parents__','__dirty__','__cache__']:
+            object.__setattr__(self,name,None)
+        return self
+    
+    def __init__(self,arg=None,lazy=False,memmap=False,select=None):
         super().__init__(self)
-        if isinstance(arg,str):
+        opened = isinstance(arg,str) # (files opened by the caller left open)
+        if opened:
+            self.__dict__['__source__'] = os.path.abspath(arg)
             arg = self.__load__(arg)
-        if arg is not None:
-            for k,v in DataDict.__convert__(arg).items():
-                if isinstance(v,convertible_types):
-                    self[k] = DataDict(v)
-                else:
-                    self[k] = v
+        if select is not None:
+            select = [p.split('.') if isinstance(p,str) else p for p in select]
+        try:
+            if arg is not None:
+                content = DataDict.__convert__(arg,lazy,memmap,select)
+                for k,v in content.items():
+                    tails = DataDict.__select_tails__(select,k)
+                    if isinstance(v,convertible_types) and tails is not False:
+                        self[k] = self.__node__(v,lazy,memmap,tails)
+                    elif tails is None:
+                        self[k] = v
+        except BaseException:
+            if opened and isinstance(arg,h5py.File): arg.close()
+            raise
+        if opened and isinstance(arg,h5py.File):
+            if lazy: self.__dict__['__h5_file__'] = arg
+            else: arg.close()
+        object.__setattr__(self,'__dirty__',None) # (as loaded)
             
     def __setitem__(self,k,v):
         self.__setattr__(k,v)
             
     def __setattr__(self,k,v):
         if type(v) is dict: 
-            v = DataDict(v)
+            v = self.__node__(v)
+        if k in self:
+            if isinstance(self[k],DataDict): 
+                self[k].__unlink__(self)
+        elif self.__cache__ is not None and 'key_order' in self.__cache__:
+            DataDict.__insert_key__(self.__cache__['key_order'],k)
         super().__setitem__(k,v)
-        if isinstance(k,str):
+        if isinstance(k,str) and not type(self).__compact__:
             self.__dict__[k] = v
+        self.__changed__(k)
+        
+    def __node__(self,*args):
+        # nested DataDicts are of the same kind (compact or not)
+        return CompactDataDict(*args) if type(self).__compact__ \
+               else DataDict(*args)
+        
+    def __delitem__(self,k):
+        if isinstance(self[k],DataDict):
+            self[k].__unlink__(self)
+        super().__delitem__(k)
+        if isinstance(k,str) and not type(self).__compact__:
+            self.__dict__.pop(k,None)
+        if self.__cache__ is not None and 'key_order' in self.__cache__:
+            keys = self.__cache__['key_order'][DataDict.__key_kind__(k)]
+            del keys[0][bisect.bisect_left(keys[0],k)]
+            keys[1] = None
+        self.__changed__(k)
+        
+    def __changed__(self,k):
+        # k set or deleted: marked as changed (see save), caches invalidated
+        if self.__dirty__ is None:
+            object.__setattr__(self,'__dirty__',set())
+        self.__dirty__.add(k)
+        if self.__cache__ is not None:
+            self.__cache__.get('digests',{}).pop(k,None)
+        self.__touch__()
+        
+    def __cached__(self):
+        if self.__cache__ is None:
+            object.__setattr__(self,'__cache__',{})
+        return self.__cache__
+        
+    def __link__(self,parent):
+        # weak references to the parents, in a slot (not in the instance 
+        # dict), only set when a cache covering self is built in a parent: 
+        # a valid cache implies links from all the nodes below it
+        parents = self.__parents__
+        if parents is None:
+            object.__setattr__(self,'__parents__',[weakref.ref(parent)])
+        elif not any(ref() is parent for ref in parents):
+            parents[:] = [ref for ref in parents if ref() is not None]
+            parents.append(weakref.ref(parent))
         
-    def __indented_repr__(self,display_function,indent='> '):
-        res = ''
+    def __unlink__(self,parent):
+        # (the parent is mutated, hence its caches invalidated: the link is 
+        # set again if they are rebuilt)
+        parents = self.__parents__
+        if parents is not None:
+            parents[:] = [ref for ref in parents if ref() is not None 
+                          and ref() is not parent]
+            if len(parents)==0:
+                object.__setattr__(self,'__parents__',None)
+            
+    def __touch__(self):
+        # a mutation in the subtree: invalidates the caches of this node and 
+        # of the nodes containing it (and only them)
+        if self.__parents__ is None:
+            return self.__invalidate__()
+        nodes,touched = [self],set()
+        while nodes:
+            node = nodes.pop()
+            if id(node) in touched:
+                continue
+            touched.add(id(node))
+            node.__invalidate__()
+            for ref in node.__parents__ or ():
+                if ref() is not None:
+                    nodes.append(ref())
+                    
+    def __invalidate__(self):
+        if self.__cache__ is not None:
+            keypaths = self.__cache__.get('keypaths')
+            if keypaths is not None and keypaths[1] is not None:
+                keypaths[1:] = [None,len(keypaths[1])] # see __keypath_index__
+            self.__cache__.pop('keys',None)
+            self.__cache__.pop('tree_digest',None)
+        
+    def setdefault(self,k,default=None):
+        if k not in self:
+            self[k] = default
+        return self[k]
+    
+    def popitem(self):
+        if len(self)==0:
+            raise KeyError('popitem(): dictionary is empty')
+        k = next(reversed(self))
+        return k,self.pop(k)
+    
+    def __ior__(self,other):
+        self.update(other)
+        return self
+        
+    def __getstate__(self): # caches are not worth pickling
+        state = dict(self.__dict__)
+        state.pop('__h5_file__',None) # (owned by the original DataDict)
+        if self.__dirty__ is not None:
+            state['__dirty__'] = self.__dirty__
+        return state
+    
+    def __setstate__(self,state):
+        # the items were set again when unpickled (which marked them as 
+        # changed): back to the changes recorded in the pickled DataDict
+        state = dict(state)
+        object.__setattr__(self,'__dirty__',state.pop('__dirty__',None))
+        if len(state)>0:
+            self.__dict__.update(state)
+        
+    def __indented_repr__(self,display_function,indent='> ',stream=None,
+                          max_chars=None,max_depth=None):
+        # written piece by piece, within a global budget of characters and 
+        # of nesting levels (None: no limit)
+        buffer = io.StringIO() if stream is None else stream
+        if max_chars is None: max_chars = DataDict.repr_max_chars
+        budget = [np.inf if max_chars is None else max_chars]
+        depth = -1 if max_depth is None else max_depth
+        self.__write_repr__(buffer,display_function,indent,budget,depth)
+        if stream is None:
+            return buffer.getvalue()
+        
+    def __write_repr__(self,stream,display_function,indent,budget,depth):
         for k,v in self.items():
+            if budget[0]<=0:
+                stream.write(indent + '...\n')
+                return False
             header = indent + str(k) + ': '
-            res += header
+            if isinstance(v,DataDict) and depth!=0:
+                DataDict.__write_budgeted__(stream,header+'\n',budget)
+                if not v.__write_repr__(stream,display_function,indent+'> ',
+                                        budget,depth-1):
+                    return False
+                continue
             if isinstance(v,DataDict):
-                res += '\n' + v.__indented_repr__(display_function,indent+'> ')
+                content = '{...}'
             else:
-                content = str(display_function(v))
-                content = content.replace('\n','\n'+' '*len(header))
-                if len(content)>500:
-                    content = content[:200] + '\n...\n' + content[-200:]
-                res += content + '\n'
-        return res
+                content = DataDict.__summary__(display_function(v))
+            content = content.replace('\n','\n'+' '*len(header))
+            if len(content)>500:
+                content = content[:200] + '\n...\n' + content[-200:]
+            DataDict.__write_budgeted__(stream,header+content+'\n',budget)
+        return True
+            
+    @staticmethod
+    def __write_budgeted__(stream,text,budget):
+        if len(text)>budget[0]:
+            text = text[:max(int(budget[0]),0)] + '...\n'
+        stream.write(text)
+        budget[0] -= len(text)
+        
+    @staticmethod
+    def __summary__(v):
+        # truncated up front rather than fully formatted then cut
+        if isinstance(v,np.ndarray):
+            with np.printoptions(threshold=100,edgeitems=3):
+                return str(v)
+        if isinstance(v,(list,tuple,set,frozenset,dict)) and len(v)>100:
+            return summary.repr(v)
+        return str(v)
                 
     def __str__(self):
         return self.__indented_repr__(lambda v:v)
@@ -100,94 +381,457 @@ N.B.: the pop method also supports a "keypath" argument;
     def __repr__(self):
         return self.__str__()
     
-    def print_keys(self):
-        print(self.__indented_repr__(lambda v:''))
+    def __enter__(self):
+        return self
+    
+    def __exit__(self,*exc_info):
+        self.close()
         
-    def print_types(self):
+    def close(self):
+        h5_file = self.__dict__.pop('__h5_file__',None)
+        if h5_file is not None:
+            h5_file.close()
+    
+    def print_keys(self,max_chars=None,max_depth=None):
+        self.__indented_repr__(lambda v:'',stream=sys.stdout,
+                               max_chars=max_chars,max_depth=max_depth)
+        
+    def print_types(self,max_chars=None,max_depth=None):
         def type_and_shape(v):
             res = type(v).__name__
-            if isinstance(v,(list,tuple,set,np.ndarray)):
+            if isinstance(v,(list,tuple,set,np.ndarray,H5Dataset)):
                 res += ' ' + str(np.shape(v))
             return res
-        print(self.__indented_repr__(type_and_shape))
+        self.__indented_repr__(type_and_shape,stream=sys.stdout,
+                               max_chars=max_chars,max_depth=max_depth)
         
     def update(self,other):
-        super().update(DataDict(other))
+        for k,v in DataDict(other).items():
+            self[k] = v
+            
+    def clear(self):
+        for k in list(self):
+            del self[k]
                                     
     def merge(self,other,no_overwriting=True):
-        if type(other) is not DataDict:
+        if not isinstance(other,DataDict):
             other = DataDict(other)
         for k in set(other)&set(self):
             if isinstance(self[k],dict) and isinstance(other[k],dict):
                 self[k].merge(other[k],no_overwriting)
-            elif no_overwriting and self[k]!=other[k]:
-                try: raise Exception('Attempt to overwrite '+k)
-                except Exception: raise
+            elif no_overwriting and not DataDict.__equal__(self[k],other[k]):
+                raise Exception(f'Attempt to overwrite {k}')
             else:
                 self[k] = other[k]
         for k in set(other)-set(self):
             self[k] = other[k]
             
+    @staticmethod
+    def merge_all(dicts,no_overwriting=True,separator='.'):
+        """ Merges all the dicts together in a single traversal, and returns
+            the merged DataDict along with a report of all the conflicts:
+            {keypath:[(index of the dict,value),…]}. In case of conflict, 
+            the first value is kept (the last one if not no_overwriting). """
+        dicts = [(i,d if isinstance(d,DataDict) else DataDict(d)) 
+                 for i,d in enumerate(dicts)]
+        merged,conflicts = DataDict(),{}
+        DataDict.__merge_all__(merged,dicts,no_overwriting,conflicts,'',
+                               separator)
+        return merged,conflicts
+    
+    @staticmethod
+    def __merge_all__(merged,dicts,no_overwriting,conflicts,root,separator):
+        values = {}
+        for i,d in dicts:
+            for k,v in d.items():
+                values.setdefault(k,[]).append((i,v))
+        for k,iv in values.items():
+            if len(iv)>1 and all(isinstance(v,dict) for _,v in iv):
+                merged[k] = DataDict()
+                DataDict.__merge_all__(merged[k],iv,no_overwriting,conflicts,
+                                       f'{root}{k}{separator}',separator)
+                continue
+            first = iv[0][1]
+            if any(not DataDict.__equal__(first,v) for _,v in iv[1:]):
+                conflicts[f'{root}{k}'] = iv
+            merged[k] = first if no_overwriting else iv[-1][1]
+            
+    @staticmethod
+    def __equal__(a,b):
+        if isinstance(a,(np.ndarray,H5Dataset)) or \
+           isinstance(b,(np.ndarray,H5Dataset)):
+            return np.array_equal(a,b)
+        if isinstance(a,dict) and isinstance(b,dict): # e.g. nested DataDicts
+            return a.keys()==b.keys() and \
+                   all(DataDict.__equal__(a[k],b[k]) for k in a)
+        if isinstance(a,(list,tuple)) and isinstance(b,(list,tuple)):
+            return type(a)==type(b) and len(a)==len(b) and \
+                   all(DataDict.__equal__(x,y) for x,y in zip(a,b))
+        try: 
+            return bool(a==b)
+        except ValueError: # other ambiguous comparisons
+            return a is b
+            
     def pop(self,key,separator='.'):
-        if separator not in key:
-            super().pop(key)
-        else:
-            branch,leaf = key.rsplit(separator,maxsplit=1)
-            parent = self.get(branch)
-            parent.pop(leaf)
-            if parent=={}:
-                self.pop(parent,separator)
+        if key in self or not isinstance(key,str) or separator not in key:
+            value = self[key]
+            del self[key]
+            return value
+        branch,leaf = key.rsplit(separator,maxsplit=1)
+        parent = self.get(branch,separator=separator)
+        value = parent.pop(leaf,separator)
+        if parent=={}:
+            self.pop(branch,separator)
+        return value
     
     def get(self,key,default=None,separator='.'):
         if key in self:
             return self[key]
-        if separator in key: 
-            root,branch = key.split(separator,maxsplit=1)
-            if isinstance(self.get(root),dict):
-                return self.get(root).get(branch,default,separator)
+        if isinstance(key,str) and separator in key:
+            index = self.__keypath_index__(separator)
+            if index is not None:
+                return index.get(key,default)
+            found,value = self.__find_keypath__(key.split(separator),separator)
+            return value if found else default
         return default
     
-    def get_below(self,key):
-        return self.get(max([k for k in self.keys() if k<=key]))
+    def get_many(self,keys,default=None,separator='.'):
+        keys = list(keys)
+        index = self.__keypath_index__(separator,len(keys))
+        if index is None:
+            return [self.get(k,default,separator) for k in keys]
+        return [index[k] if k in index else dict.get(self,k,default) 
+                for k in keys]
+    
+    def __keypath_index__(self,separator='.',lookups=1):
+        # flat {keypath:value} dict of the whole tree, built lazily. After a 
+        # mutation of the tree, it is only rebuilt once as many lookups as it
+        # had entries have been made without it (None is returned meanwhile, 
+        # for the keypaths to be found node by node): alternating lookups 
+        # and mutations thus cost O(depth) each, and lookups alone O(1)
+        cache = self.__cached__().get('keypaths') # [separator,index,budget]
+        if cache is not None and cache[0]==separator:
+            if cache[1] is not None:
+                return cache[1]
+            cache[2] -= lookups
+            if cache[2]>0:
+                return None
+        index = {}
+        self.__index_keypaths__(index,'',separator)
+        self.__cache__['keypaths'] = [separator,index,0]
+        return index
+    
+    def __index_keypaths__(self,index,root,separator):
+        for k,v in self.items(): # shallower keys take precedence
+            if isinstance(k,str):
+                index.setdefault(root+k,v)
+        for k,v in self.items():
+            if isinstance(k,str) and isinstance(v,DataDict):
+                v.__link__(self)
+                v.__index_keypaths__(index,root+k+separator,separator)
+                
+    def __find_keypath__(self,keys,separator):
+        # (found,value) for the keypath split into keys, with the same 
+        # precedence as the index (a key containing the separator first)
+        keypath = separator.join(keys)
+        if keypath in self:
+            return True,self[keypath]
+        for i in range(1,len(keys)):
+            v = dict.get(self,separator.join(keys[:i]))
+            if isinstance(v,DataDict):
+                found,value = v.__find_keypath__(keys[i:],separator)
+                if found:
+                    return found,value
+        return False,None
+    
+    def get_below(self,key,default=None):
+        return self.__get_nearest__(key,default,below=True)
+    
+    def get_above(self,key,default=None):
+        return self.__get_nearest__(key,default,below=False)
+    
+    def __get_nearest__(self,key,default,below):
+        # keys compared only to keys of the same kind (numbers, str…), with 
+        # one sorted list per kind, kept up to date by __setattr__/__delitem__
+        if isinstance(key,np.ndarray): # vectorized version
+            kind = 'number' if key.dtype.kind in 'biuf' else key.dtype.name
+            kind = 'str' if key.dtype.kind=='U' else kind
+            keys = self.__sorted_keys__().get(kind)
+            if keys is None: # no key of this kind
+                return [default]*key.size
+            sorted_keys,array = keys
+            if array is None: 
+                array = keys[1] = np.array(sorted_keys)
+            side = 'right' if below else 'left'
+            indices = np.searchsorted(array,key,side) - int(below)
+            return [self[sorted_keys[i]] if 0<=i<len(sorted_keys) 
+                    else default for i in indices.flat]
+        sorted_keys = self.__sorted_keys__().get(DataDict.__key_kind__(key),
+                                              [[]])[0]
+        if below:
+            i = bisect.bisect_right(sorted_keys,key) - 1
+        else:
+            i = bisect.bisect_left(sorted_keys,key)
+        return self[sorted_keys[i]] if 0<=i<len(sorted_keys) else default
+    
+    def __sorted_keys__(self):
+        # {kind of key:[sorted list of keys,same as array or None]}
+        key_order = self.__cached__().get('key_order')
+        if key_order is None:
+            key_order = {}
+            for k in self:
+                key_order.setdefault(DataDict.__key_kind__(k),[[],None])
+                key_order[DataDict.__key_kind__(k)][0].append(k)
+            for keys in key_order.values():
+                keys[0].sort()
+            self.__cache__['key_order'] = key_order
+        return key_order
+    
+    @staticmethod
+    def __insert_key__(key_order,k):
+        keys = key_order.setdefault(DataDict.__key_kind__(k),[[],None])
+        bisect.insort(keys[0],k)
+        keys[1] = None
     
-    def get_above(self,key):
-        return self.get(min([k for k in self.keys() if k>=key]))
+    @staticmethod
+    def __key_kind__(k):
+        return 'number' if isinstance(k,numbers.Real) else type(k).__name__
         
     def select(self,keys,separator='.'):
-        d = DataDict()
+        keys = list(keys)
+        d,index = DataDict(),self.__keypath_index__(separator,len(keys))
         for key in keys:
-            d.merge(DataDict.__expand_keypath__(key,self.get(key),separator))
+            if key in self or not isinstance(key,str):
+                path,value = [key],dict.get(self,key)
+            else:
+                path = key.split(separator)
+                value = index.get(key) if index is not None else \
+                        self.get(key,separator=separator)
+            node = d
+            for k in path[:-1]:
+                if not isinstance(dict.get(node,k),DataDict):
+                    node[k] = DataDict()
+                node = node[k]
+            if isinstance(value,DataDict):
+                value = DataDict(value)
+            if isinstance(dict.get(node,path[-1]),DataDict) and \
+                                                  isinstance(value,DataDict):
+                node[path[-1]].merge(value)
+            else:
+                node[path[-1]] = value
         return d
     
-    def search(self,key,partial=False,root='',separator='.'):
-        res = []
+    def search(self,key,partial=False,root='',separator='.',mode=None):
+        """ mode: 'exact' (default), 'substring' (default if partial), 
+            'prefix', 'glob' or 'regex' (re.search), matched against keys. 
+            Answered from an index of the keys of the tree, built by the 
+            first search and rebuilt by the next one after a mutation of 
+            this tree (only). """
+        if mode is None: 
+            mode = 'substring' if partial else 'exact'
+        names,sorted_names = self.__key_index__(separator)
+        if mode=='exact':
+            matches = names.get(key,[])
+        else:
+            if mode=='substring':
+                selected = [name for name in names if key in name]
+            elif mode=='prefix':
+                start = bisect.bisect_left(sorted_names,key)
+                selected = itertools.takewhile(lambda n:n.startswith(key),
+                                               sorted_names[start:])
+            elif mode in ['glob','regex']:
+                pattern = fnmatch.translate(key) if mode=='glob' else key
+                search = re.compile(pattern).search
+                selected = [name for name in names if search(name)]
+            else: raise ValueError(f'Unknown search mode {mode}')
+            matches = sorted(m for name in selected for m in names[name])
         if root!='': root += separator
-        for k in self:
-            if (not partial and key==k) or (partial and key in k):
-                res.append(root+k)
-            if isinstance(self[k],DataDict): 
-                res += self[k].search(key,root+k,separator)
+        return [root+keypath for _,keypath in matches]
+    
+    def __key_index__(self,separator='.'):
+        # {key:[(rank,keypath),…]} for all the keys of the tree, with their 
+        # rank in depth-first order, and the sorted list of the keys. 
+        # Rebuilt (not patched) after a mutation of the tree: a node knows 
+        # its parents (__link__) but not the keys it is held under, i.e. 
+        # not its keypaths, and an insertion shifts the ranks of all the 
+        # keypaths that follow it
+        separator_,index = self.__cached__().get('keys',(None,None))
+        if separator_!=separator:
+            names,keypaths = {},self.__walk_keypaths__('',separator)
+            for rank,(name,keypath) in enumerate(keypaths):
+                names.setdefault(name,[]).append((rank,keypath))
+            index = (names,sorted(names))
+            self.__cache__['keys'] = (separator,index)
+        return index
+    
+    def __walk_keypaths__(self,root,separator):
+        for k,v in self.items():
+            if isinstance(k,str):
+                yield k,root+k
+                if isinstance(v,DataDict):
+                    v.__link__(self)
+                    yield from v.__walk_keypaths__(root+k+separator,separator)
+                    
+    def __walk_leaves__(self,path=()):
+        # (tuple of keys,value) for all the values that are not DataDicts
+        for k,v in self.items():
+            if isinstance(v,DataDict):
+                yield from v.__walk_leaves__(path+(k,))
+            else:
+                yield path+(k,),v
+    
+    def memory_report(self):
+        """ Bytes used by the values, by the dicts holding them, and by the
+            instance dicts (attributes, i.e. mostly copies of the keys and
+            values for a DataDict; avoided with a CompactDataDict). """
+        report = DataDict({'nodes':0,'values':0,'dicts':0,
+                           'attribute_dicts':0})
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            report['nodes'] += 1
+            report['dicts'] += sys.getsizeof(node)
+            if not type(node).__compact__: # (would create it otherwise)
+                report['attribute_dicts'] += sys.getsizeof(node.__dict__)
+            for v in node.values():
+                if isinstance(v,DataDict):
+                    nodes.append(v)
+                elif isinstance(v,np.ndarray):
+                    report['values'] += sys.getsizeof(v) + \
+                                        (v.nbytes if v.base is not None else 0)
+                else:
+                    report['values'] += sys.getsizeof(v)
+        return report
+    
+    def digest(self):
+        return self.__digest__().hex()
+    
+    def __digest__(self):
+        # hash of the keys and values of the subtree, independent of the 
+        # order of the keys; cached until the subtree is mutated, and the 
+        # hashes of the values until they are replaced (arrays modified in 
+        # place are thus not detected)
+        digest = self.__cached__().get('tree_digest')
+        if digest is not None:
+            return digest
+        pairs = []
+        for k,v in self.items():
+            if isinstance(v,DataDict):
+                v.__link__(self)
+                value_digest = v.__digest__()
+            else:
+                value_digest = self.__value_digest__(k)
+            pairs.append(DataDict.__hash_value__(k) + value_digest)
+        digest = hashlib.blake2b(b''.join(sorted(pairs)),digest_size=16).digest()
+        self.__cache__['tree_digest'] = digest
+        return digest
+    
+    def __value_digest__(self,k):
+        digests = self.__cached__().setdefault('digests',{})
+        if k not in digests:
+            digests[k] = DataDict.__hash_value__(self[k])
+        return digests[k]
+        
+    @staticmethod
+    def __hash_value__(v):
+        if isinstance(v,H5Dataset):
+            v = v.read()
+        if isinstance(v,np.ndarray) and not v.dtype.hasobject \
+           and not isinstance(v,np.ma.MaskedArray): # buffer hashed directly
+            h = hashlib.blake2b(b'array',digest_size=16) # (or memmap…)
+            h.update(v.dtype.str.encode() + str(v.shape).encode())
+            h.update(np.ascontiguousarray(v).data)
+        else:
+            h = hashlib.blake2b(type(v).__name__.encode(),digest_size=16)
+            try: 
+                h.update(pickle.dumps(v,protocol=4))
+            except Exception:
+                h.update(repr(v).encode())
+        return h.digest()
+    
+    def diff(self,other,separator='.'):
+        """ Keypaths added, removed or changed from self to other, found by 
+            comparing the digests of the subtrees (explored only if they 
+            differ). """
+        if not isinstance(other,DataDict):
+            other = DataDict(other)
+        res = DataDict({'added':[],'removed':[],'changed':[]})
+        self.__diff__(other,'',separator,res)
         return res
     
+    def __diff__(self,other,root,separator,res):
+        for k in self:
+            if k not in other:
+                res['removed'].append(f'{root}{k}')
+        for k,v in other.items():
+            if k not in self:
+                res['added'].append(f'{root}{k}')
+            elif isinstance(self[k],DataDict) and isinstance(v,DataDict):
+                if self[k].__digest__()!=v.__digest__():
+                    self[k].__diff__(v,f'{root}{k}{separator}',separator,res)
+            elif isinstance(self[k],DataDict) or isinstance(v,DataDict) or \
+                 self.__value_digest__(k)!=other.__value_digest__(k):
+                res['changed'].append(f'{root}{k}')
+                
+    @staticmethod
+    def deduplicate(dicts):
+        """ Makes identical arrays (same digest) among all the DataDicts be a
+            single one, shared (then not to be modified in place); returns the
+            number of bytes spared. """
+        arrays,spared = {},0
+        for d in dicts:
+            for path,v in d.__walk_leaves__():
+                if not isinstance(v,np.ndarray):
+                    continue
+                node = d
+                for k in path[:-1]:
+                    node = node[k]
+                digest = node.__value_digest__(path[-1])
+                if digest not in arrays:
+                    arrays[digest] = v
+                elif arrays[digest] is not v:
+                    node[path[-1]] = arrays[digest]
+                    node.__cache__['digests'][path[-1]] = digest
+                    spared += v.nbytes
+        return spared
+    
     def rename(self,conversion_dict):
         for old_key,new_key in conversion_dict.items(): 
-            if old_key in self:
+            if old_key in self and old_key!=new_key:
                 self[new_key] = self[old_key]
                 self.pop(old_key)
                 
-    def copy(self):
-        return copy.deepcopy(self)
+    def copy(self,cow=False):
+        if not cow:
+            return copy.deepcopy(self)
+        d = self.__node__()
+        for k,v in self.items():
+            if isinstance(v,DataDict):
+                v = v.copy(cow=True)
+            elif isinstance(v,np.ndarray): # shared buffer, protected in
+                v = v.view()               # the copy only
+                v.flags.writeable = False
+            elif not isinstance(v,H5Dataset):
+                v = copy.deepcopy(v)
+            d[k] = v
+        return d
     
     @staticmethod
-    def __expand_keypath__(key,value,separator='.'):
-        if isinstance(key,str) and separator in key:
-            branch,leaf = key.rsplit(separator,maxsplit=1)
-            return DataDict.__expand_keypath__(branch,{leaf:value})
-        else:
-            return {key:value}
+    def __select_tails__(select,k):
+        # None if k is selected with all its content, False if not selected,
+        # otherwise the list of the patterns to select within k
+        if select is None:
+            return None
+        tails = []
+        for pattern in select:
+            if fnmatch.fnmatchcase(str(k),pattern[0]):
+                if len(pattern)==1:
+                    return None
+                tails.append(pattern[1:])
+        return tails if len(tails)>0 else False
     
     @staticmethod
-    def __convert__(obj):
+    def __convert__(obj,lazy=False,memmap=False,select=None):
         if isinstance(obj,pd.Series):
             return dict(obj)
         if isinstance(obj,pd.DataFrame):
@@ -195,30 +839,56 @@ N.B.: the pop method also supports a "keypath" argument;
         if isinstance(obj,(h5py._hl.files.File,
                            h5py._hl.group.Group,
                            h5py._hl.dataset.Dataset)):
-            attrs = dict(obj.attrs)
+            # only the selected objects are opened and read
+            selected = lambda k:DataDict.__select_tails__(select,k) is not False
+            attrs = dict(obj.attrs) if selected('attrs') else {}
             attrs_dict = {'attrs':attrs} if len(attrs)!=0 else {}
             if isinstance(obj,h5py._hl.dataset.Dataset):
+                content = {}
                 if obj.shape!=():
-                    content = {'data':obj[:],'shape':obj.shape,'dtype':obj.dtype}
-                else: content = {}
+                    if selected('data'):
+                        data = DataDict.__memmap__(obj) if memmap else None
+                        if data is None:
+                            data = H5Dataset(obj) if lazy else obj[:]
+                        content['data'] = data
+                    content.update({'shape':obj.shape,'dtype':obj.dtype})
             else:
-                content = dict(obj)
+                content = {k:obj[k] for k in obj.keys() if selected(k)}
             return {**attrs_dict,**content}
         else:
             return obj
     
     @staticmethod
-    def __encode__(x,name=None):
-        if isinstance(x,(bool,str,int,float,type(None),list,dict)):
-            return x # copy.deepcopy(x)
-        elif isinstance(x,(set,tuple)):
-            return list(x)
+    def __memmap__(dataset):
+        # read-only view of the file itself, if the dataset is stored in it 
+        # as a contiguous block of raw values (None otherwise)
+        offset = dataset.id.get_offset()
+        if offset is None or dataset.chunks is not None \
+           or dataset.dtype.hasobject or dataset.external:
+            return None
+        return np.memmap(dataset.file.filename,dtype=dataset.dtype,mode='r',
+                         offset=offset,shape=dataset.shape)
+    
+    @staticmethod
+    def __encode__(x,name=None,arrays=None,sidecar=None):
+        if isinstance(x,(bool,str,int,float,type(None))):
+            return x
+        elif isinstance(x,dict):
+            return {k:DataDict.__encode__(v,f'{name}.{k}',arrays,sidecar) 
+                    for k,v in x.items()}
+        elif isinstance(x,(list,set,tuple)):
+            return [DataDict.__encode__(v,f'{name}.{i}',arrays,sidecar) 
+                    for i,v in enumerate(x)]
+        elif isinstance(x,np.bool_):
+            return bool(x)
         elif isinstance(x,type):
             return str(x.__name__)
         elif isinstance(x,np.dtype):
             return str(x.name)
         elif isinstance(x,np.ndarray):
-            return x.tolist()
+            return encode_array(x,arrays,sidecar,name)
+        elif isinstance(x,H5Dataset):
+            return encode_array(x.read(),arrays,sidecar,name)
         elif isinstance(x,np.integer):
             return int(x)
         elif isinstance(x,np.floating):
@@ -232,17 +902,87 @@ N.B.: the pop method also supports a "keypath" argument;
             if name is not None: warning += f' ({name})'
             raise TypeError(warning)
             
-    def to_json_serializable(self):
-        return {k:DataDict.__encode__(v,k) for k,v in self.items()}
+    @staticmethod
+    def from_dataframe(df,separator='.'):
+        """ Column-oriented conversion (DataDict(df) gives one dict per row):
+            each column is kept as a single array, at the keypath given by
+            its name; a non-default index is kept as well (as with 
+            df.reset_index()). """
+        if df.index.name is not None or \
+           not df.index.equals(pd.RangeIndex(len(df))):
+            df = df.reset_index()
+        d = DataDict()
+        for column in df.columns:
+            path = column.split(separator) if isinstance(column,str) \
+                   else [column]
+            node = d
+            for i,k in enumerate(path[:-1]):
+                if k not in node:
+                    node[k] = DataDict()
+                elif not isinstance(node[k],DataDict):
+                    clash = separator.join(str(k) for k in path[:i+1])
+                    raise ValueError(f'Column {column!r} clashes with column '
+                                     f'{clash!r} (keypath both a value and '
+                                     'a branch)')
+                node = node[k]
+            if path[-1] in node:
+                raise ValueError(f'Column {column!r} clashes with the columns '
+                                 'below it (keypath both a value and a branch)')
+            node[path[-1]] = df[column].to_numpy()
+        return d
+    
+    def to_dataframe(self,index=None,separator='.'):
+        """ A single row, with one column per keypath (arrays and other 
+            values kept as they are in the cells); see ShotCollection for 
+            one row per shot. """
+        columns = {}
+        for path,v in self.__walk_leaves__():
+            if isinstance(v,H5Dataset):
+                v = v.read()
+            columns[separator.join(str(k) for k in path)] = [v]
+        df = pd.DataFrame(columns)
+        return df if index is None else df.set_index(index)
+    
+    def to_json_serializable(self,arrays=None,sidecar=None,root=''):
+        res = {}
+        for k,v in self.items():
+            if isinstance(v,DataDict):
+                res[k] = v.to_json_serializable(arrays,sidecar,f'{root}{k}.')
+            else:
+                res[k] = DataDict.__encode__(v,f'{root}{k}',arrays,sidecar)
+        return res
+    
+    def __iter_json__(self,arrays=None,sidecar=None,root=''):
+        # JSON text of the DataDict, chunk by chunk (one per key or value)
+        yield '{'
+        for i,(k,v) in enumerate(self.items()):
+            if not isinstance(k,(str,int,float,bool,type(None))):
+                raise TypeError(f'Keys of type {type(k)} not allowed in JSON')
+            key = k if isinstance(k,str) else json.dumps(k)
+            yield (', ' if i>0 else '') + json.dumps(key) + ': '
+            if isinstance(v,DataDict):
+                yield from v.__iter_json__(arrays,sidecar,f'{root}{k}.')
+            else:
+                yield json.dumps(DataDict.__encode__(v,f'{root}{k}',arrays,
+                                                     sidecar))
+        yield '}'
+        
+    @staticmethod
+    def __split_extension__(path):
+        base,extension = path.rsplit('.',1)
+        if extension in ['gz','xz'] and base.endswith('.json'):
+            base,extension = base[:-5],'json.'+extension
+        return base,extension
         
     def __load__(self,path):
-        extension = path.rsplit('.',1)[1]
-        if extension=='json':
-            with open(path) as f:
-                return json.load(f)
+        _,extension = DataDict.__split_extension__(path)
+        if extension in json_openers:
+            folder = os.path.dirname(path)
+            with json_openers[extension](path,'rt') as f:
+                return json.load(f,object_hook=lambda obj:decode_array(obj,
+                                                                      folder))
         elif extension=='h5':
-            self.h5_file = h5py.File(path,'r')
-            return self.h5_file
+            return h5py.File(path,'r')
         # elif extension in ['dat','txt']:
         #     header = open(path).readline()[1:-1].split('\t')
         #     array = np.loadtxt(path)
@@ -253,10 +993,183 @@ N.B.: the pop method also supports a "keypath" argument;
                 # return np.array(list(csv.reader(f,delimiter=';')))
         else: raise Exception('Unknown file extension')
         
-    def save(self,path):
+    def save(self,path,compression=None,chunks=True,arrays=None,full=False):
+        """ .json (.json.gz, .json.xz): arrays='base64' or 'npy' to store the
+            arrays as raw buffers rather than as lists.
+            .h5: compression and chunks passed to h5py for the datasets. 
+            The tree is written as __convert__ reads it ('attrs' -> attributes,
+            {'data','shape','dtype'} -> datasets), so that a DataDict loaded 
+            from an .h5 file comes back identical. Other trees come back in 
+            this form: values other than arrays become attributes of their 
+            group (under 'attrs' when reloaded), arrays become datasets 
+            (reloaded as {'data','shape','dtype'}), and values that h5py 
+            cannot store (None, dicts…) are stored as JSON text. 
+            Saved to the .h5 file it was loaded from, only the keys set or 
+            deleted since are rewritten: arrays modified in place (x[i] = …)
+            are not noticed, full=True rewrites the whole file instead. """
         # folder,_ = os.path.split(path)
         # Path(folder).mkdir(parents=True,exist_ok=True)
-        extension = path.rsplit('.',1)[1]
-        if extension=='json':
-            with open(path,'w') as f:
-                json.dump(self.to_json_serializable(),f)
\ No newline at end of file
+        base,extension = DataDict.__split_extension__(path)
+        if extension in json_openers:
+            sidecar = base + '_arrays'
+            with json_openers[extension](path,'wt') as f:
+                for chunk in self.__iter_json__(arrays,sidecar):
+                    f.write(chunk)
+        elif extension=='h5':
+            path = os.path.abspath(path)
+            source = path==self.__dict__.get('__source__')
+            if source and '__h5_file__' in self.__dict__:
+                raise Exception('Close the lazily loaded file first')
+            if source and os.path.exists(path) and not full:
+                with h5py.File(path,'r+') as f: # only the changes
+                    self.__save_changes__(f,compression,chunks)
+            elif source: # (arrays may still be mapped from the old file)
+                with h5py.File(path+'.tmp','w') as f:
+                    self.__write_h5__(f,compression,chunks)
+                os.replace(path+'.tmp',path)
+            else:
+                with h5py.File(path,'w') as f:
+                    self.__write_h5__(f,compression,chunks)
+        else: raise Exception('Unknown file extension')
+        self.__clean__()
+        self.__dict__['__source__'] = os.path.abspath(path)
+        
+    def __changes__(self):
+        return self.__dirty__ or set()
+    
+    def __has_changed__(self):
+        # keys set or deleted since loaded or saved, in this whole subtree
+        return len(self.__changes__())>0 or any(v.__has_changed__() 
+                   for v in self.values() if isinstance(v,DataDict))
+    
+    def __clean__(self):
+        object.__setattr__(self,'__dirty__',None)
+        for v in self.values():
+            if isinstance(v,DataDict):
+                v.__clean__()
+                
+    def __save_changes__(self,group,compression=None,chunks=True):
+        # rewrites only the subtrees that changed in the file it comes from
+        changes = self.__changes__()
+        for k in changes:
+            if k=='attrs':
+                continue
+            if str(k) in group:
+                del group[str(k)]
+            if str(k) in group.attrs:
+                del group.attrs[str(k)]
+            if k in self:
+                DataDict.__write_item__(group,k,self[k],compression,chunks)
+        self.__save_attrs__(group)
+        for k,v in self.items():
+            if k=='attrs' or k in changes or not isinstance(v,DataDict) \
+               or not v.__has_changed__():
+                continue
+            obj = group.get(str(k))
+            if isinstance(obj,h5py.Group):
+                v.__save_changes__(obj,compression,chunks)
+            elif isinstance(obj,h5py.Dataset) and \
+                 v.__changes__()|{'attrs','data'}=={'attrs','data'} and \
+                 np.shape(v.get('data'))==obj.shape and \
+                 getattr(v.get('data'),'dtype',None)==obj.dtype: # in place
+                if 'data' in v.__changes__():
+                    obj[...] = v['data']
+                v.__save_attrs__(obj)
+            else:
+                if obj is not None:
+                    del group[str(k)]
+                DataDict.__write_item__(group,k,v,compression,chunks)
+                
+    def __save_attrs__(self,obj):
+        attrs = dict.get(self,'attrs')
+        if 'attrs' in self.__changes__(): # replaced or deleted
+            for name in list(obj.attrs):
+                if name not in [str(k) for k in self]: 
+                    del obj.attrs[name]
+            for name,x in (attrs or {}).items():
+                DataDict.__write_attr__(obj,name,x)
+        elif isinstance(attrs,DataDict):
+            for name in attrs.__changes__():
+                if name in attrs:
+                    DataDict.__write_attr__(obj,name,attrs[name])
+                elif str(name) in obj.attrs:
+                    del obj.attrs[str(name)]
+        
+    def __write_h5__(self,group,compression=None,chunks=True):
+        for k,v in self.items():
+            DataDict.__write_item__(group,k,v,compression,chunks)
+    
+    @staticmethod
+    def __write_item__(group,k,v,compression=None,chunks=True):
+        # mirror image of __convert__: 'attrs' -> attributes of the group,
+        # {'data','shape','dtype','attrs'} -> dataset, DataDict -> group,
+        # other arrays -> datasets, other values -> attributes of the group
+        if k=='attrs' and isinstance(v,dict):
+            for name,x in v.items():
+                DataDict.__write_attr__(group,name,x)
+        elif DataDict.__is_dataset__(v):
+            dataset = DataDict.__write_dataset__(group,k,v['data'],
+                                                 compression,chunks)
+            for name,x in v.get('attrs',{}).items():
+                DataDict.__write_attr__(dataset,name,x)
+        elif isinstance(v,DataDict):
+            v.__write_h5__(group.create_group(str(k)),compression,chunks)
+        elif isinstance(v,(np.ndarray,H5Dataset)) and np.ndim(v)>0:
+            DataDict.__write_dataset__(group,k,v,compression,chunks)
+        else:
+            DataDict.__write_attr__(group,k,v)
+    
+    @staticmethod
+    def __is_dataset__(v):
+        return (isinstance(v,dict) and set(v)<={'data','shape','dtype','attrs'} 
+                and isinstance(v.get('data'),(np.ndarray,H5Dataset)))
+    
+    @staticmethod
+    def __write_dataset__(group,k,data,compression=None,chunks=True):
+        data = np.asarray(data)
+        if data.size==0: # cannot be chunked
+            compression,chunks = None,None
+        return group.create_dataset(str(k),data=data,chunks=chunks,
+                                    compression=compression,
+                                    shuffle=compression is not None)
+    
+    @staticmethod
+    def __write_attr__(obj,k,v):
+        try: 
+            obj.attrs[str(k)] = v
+            return
+        except (TypeError,ValueError): 
+            pass
+        try:
+            encoded = DataDict.__encode__(v,str(k))
+        except TypeError as error:
+            warnings.warn(f'{error}: attribute not saved')
+            return
+        try:
+            obj.attrs[str(k)] = encoded
+        except (TypeError,ValueError): # e.g. None, dicts: as JSON text
+            obj.attrs[str(k)] = json.dumps(encoded)
+            
+class CompactDataDict(DataDict):
+    """
+DataDict storing each value only once, in the dict itself: the keys remain
+accessible as attributes (and autocompleted), but through __getattr__ rather
+than through copies in the instance __dict__ of every node, which saves a 
+lot of memory for trees of many small values (see memory_report: about 
+half as much for nodes holding a few floats). 
+Keys named as dict methods (d.copy, d.keys…) are then only accessible as 
+keys (d['copy']).
+    >>> d = CompactDataDict(filepath.h5) # or CompactDataDict(a_DataDict)
+    """
+    
+    __compact__ = True
+    
+    def __getattr__(self,k):
+        try: 
+            return self[k]
+        except KeyError: 
+            raise AttributeError(k) from None
+            
+    def __dir__(self):
+        return list(super().__dir__()) + [k for k in self 
+                                          if isinstance(k,str)]
\ No newline at end of file
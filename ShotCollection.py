@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026, @author: Simon
+"""
+
+import numpy as np
+import pandas as pd
+from DataDict import DataDict
+
+class ShotCollection(DataDict):
+    """
+A DataDict gathering many shots (DataDicts with similar trees) in columns:
+each keypath found among the shots holds a single array, with one entry per 
+shot (NaN, or masked entry, where the key is missing from a shot). A key
+holding a leaf in some shots and a branch in others raises a ValueError.
+
+    >>> shots = ShotCollection([DataDict(path) for path in filepaths])
+    >>> shots.globals.Dimple.attrs.power # one array, no copy
+    >>> shots.images.absorption.data.data # images stacked along axis 0
+    >>> shots.filter(shots.globals.attrs.power>1).sort('globals.attrs.power')
+    >>> shots.shot(3) # back to the DataDict of a single shot
+    """
+    
+    def __init__(self,shots=None):
+        super().__init__()
+        shots = [s if isinstance(s,DataDict) else DataDict(s) 
+                 for s in (shots or [])]
+        self.__dict__['__nb_shots__'] = len(shots)
+        self.__dict__['__present__'] = {} # {path:mask of the shots having it}
+        columns = {}
+        for i,shot in enumerate(shots):
+            for path,v in shot.__walk_leaves__():
+                if path not in columns:
+                    columns[path] = [missing]*len(shots)
+                columns[path][i] = v
+        for path,values in columns.items():
+            present = np.array([v is not missing for v in values],dtype=bool)
+            self.__set_column__(path,ShotCollection.__column__(values),present)
+            
+    @property
+    def nb_shots(self):
+        return self.__dict__['__nb_shots__']
+    
+    def __set_column__(self,path,column,present):
+        node = self
+        for i,k in enumerate(path[:-1]):
+            if k not in node:
+                node[k] = DataDict()
+            node = node[k]
+            if not isinstance(node,DataDict):
+                raise ValueError(f'Keypath {path} clashes with the leaf '
+                                 f'{path[:i+1]} of other shots')
+        if path[-1] in node and isinstance(node[path[-1]],DataDict):
+            raise ValueError(f'Leaf {path} clashes with the branch of other shots')
+        node[path[-1]] = column
+        self.__dict__['__present__'][path] = present
+        
+    def present(self,path):
+        """ Mask of the shots having the given path (tuple of keys). """
+        present = self.__dict__['__present__'].get(path)
+        return np.ones(self.nb_shots,dtype=bool) if present is None else present
+    
+    @staticmethod
+    def __column__(values):
+        is_missing = np.array([v is missing for v in values],dtype=bool)
+        present = [v for v in values if v is not missing]
+        shapes = {np.shape(v) for v in present}
+        dtypes = [v.dtype if isinstance(v,(np.ndarray,np.generic)) 
+                  else np.asarray(v).dtype for v in present]
+        kinds = {dtype.kind for dtype in dtypes}
+        if len(shapes)==1 and kinds<=set('biufc'):
+            if not is_missing.any():
+                return np.array(present)
+            dtype = np.result_type(*dtypes,np.float64)
+            column = np.full((len(values),*shapes.pop()),np.nan,dtype=dtype)
+            column[~is_missing] = present
+            return column
+        column = np.empty(len(values),dtype=object)
+        for i,v in enumerate(values):
+            column[i] = None if v is missing else v
+        if len(shapes)==1 and kinds<=set('US'): # strings, of any length
+            column = np.array(list(column),dtype=str)
+        if is_missing.any():
+            return np.ma.masked_array(column,mask=is_missing)
+        return column
+    
+    def take(self,indices):
+        """ New collection with the shots at the given indices (or mask). """
+        res = ShotCollection()
+        res.__dict__['__nb_shots__'] = len(np.arange(self.nb_shots)[indices])
+        for path,column in self.__walk_leaves__():
+            res.__set_column__(path,column[indices],self.present(path)[indices])
+        return res
+    
+    def filter(self,mask):
+        return self.take(np.asarray(mask,dtype=bool))
+    
+    def sort(self,keypath,reverse=False):
+        order = np.argsort(self.get(keypath),kind='stable')
+        return self.take(order[::-1] if reverse else order)
+    
+    def to_dataframe(self,index=None,separator='.'):
+        """ One row per shot and one column per keypath, with the arrays of 
+            higher dimension split along their first axis (one per cell). """
+        columns = {}
+        for path,column in self.__walk_leaves__():
+            keypath = separator.join(str(k) for k in path)
+            columns[keypath] = list(column) if np.ndim(column)>1 else column
+        df = pd.DataFrame(columns)
+        return df if index is None else df.set_index(index)
+    
+    def shot(self,i):
+        """ DataDict of the i-th shot (without its missing keys). """
+        res = DataDict()
+        for path,column in self.__walk_leaves__():
+            if not self.present(path)[i]:
+                continue
+            node = res
+            for k in path[:-1]:
+                if k not in node:
+                    node[k] = DataDict()
+                node = node[k]
+            node[path[-1]] = column[i]
+        return res
+    
+missing = object() # placeholder for the keys missing from some of the shots
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026, @author: Simon
+"""
+
+import os
+import pickle
+import hashlib
+from pathlib import Path
+from DataDict import DataDict
+
+class ConversionCache:
+    """
+On-disk cache of the DataDicts converted from datafiles, stored pickled 
+(fast to reload), keyed by filepath and loading options, and invalidated as 
+soon as the size or the modification time of the datafile changes. 
+When the cache exceeds max_size (bytes), the least recently used entries 
+are deleted. The size of the cache is tracked as entries are written, and
+the folder is only scanned when it exceeds max_size (entries written by
+other processes in the meantime are counted at the next scan).
+    >>> cache = ConversionCache(max_size=20E9)
+    >>> d = cache.load(filepath,select=['globals']) # instead of DataDict(…)
+    >>> print(cache.report())
+    """
+    
+    def __init__(self,folder=None,max_size=10E9):
+        if folder is None:
+            folder = os.path.join(os.path.expanduser('~'),'.cache','DataDict')
+        Path(folder).mkdir(parents=True,exist_ok=True)
+        self.folder,self.max_size = folder,max_size
+        self.hits,self.misses = 0,0
+        self.total = None # running size of the cache, scanned once if None
+        
+    def load(self,path,**options):
+        if options.get('lazy') or options.get('memmap'): # tied to the file
+            return DataDict(path,**options)
+        stat = os.stat(path)
+        signature = (stat.st_size,stat.st_mtime_ns)
+        key = repr((os.path.abspath(path),sorted(options.items())))
+        entry = os.path.join(self.folder,
+                             hashlib.sha1(key.encode()).hexdigest()+'.pickle')
+        try:
+            with open(entry,'rb') as f:
+                if pickle.load(f)==signature:
+                    d = pickle.load(f)
+                    os.utime(entry) # as recently used
+                    self.hits += 1
+                    return d
+        except Exception: # missing or unreadable entry
+            pass
+        self.misses += 1
+        d = DataDict(path,**options)
+        with open(entry+'.tmp','wb') as f:
+            pickle.dump(signature,f)
+            pickle.dump(d,f,protocol=pickle.HIGHEST_PROTOCOL)
+        if self.total is None:
+            self.total = self.size()
+        else:
+            try: # replaced entry (outdated or unreadable)
+                self.total -= os.stat(entry).st_size
+            except FileNotFoundError:
+                pass
+            self.total += os.stat(entry+'.tmp').st_size
+        os.replace(entry+'.tmp',entry)
+        if self.total>self.max_size:
+            self.evict()
+        return d
+        
+    def evict(self):
+        entries = [e for e in self.__entries__() if e.name.endswith('.pickle')]
+        entries = [(e.stat().st_mtime,e.stat().st_size,e.path) for e in entries]
+        size = sum(e[1] for e in entries)
+        for _,entry_size,entry in sorted(entries):
+            if size<=self.max_size:
+                break
+            os.remove(entry)
+            size -= entry_size
+        self.total = size
+            
+    def __entries__(self): # (any other file of the folder left alone)
+        return [e for e in os.scandir(self.folder) 
+                if e.name.endswith(('.pickle','.pickle.tmp'))]
+            
+    def size(self):
+        return sum(e.stat().st_size for e in self.__entries__())
+    
+    def clear(self):
+        for e in self.__entries__():
+            os.remove(e.path)
+        self.total = 0
+            
+    def report(self):
+        total = self.hits + self.misses
+        rate = self.hits/total if total>0 else 0
+        return (f'{self.hits} hits, {self.misses} misses ({rate:.0%} hit rate)'
+                f', {self.size()/1E6:.1f} MB in {self.folder}')
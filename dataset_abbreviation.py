@@ -11,6 +11,7 @@ To simplify the description of such a choice of branches, we choose to
 """
 import os
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 def develop_abbreviation(abbreviation,start=()):
     """
@@ -27,28 +28,120 @@ def develop_abbreviation(abbreviation,start=()):
         develop( [(2023,7,[5, (6,[1,2]) ])] )
             -> [ (2023,7,5), (2023,7,6,1), (2023,7,6,2) ]
     """
-    list_of_coordinates = []
+    return list(iter_abbreviation(abbreviation,start))
+
+def iter_abbreviation(abbreviation,start=()):
+    """ 
+    Same as develop_abbreviation, yielding the coordinates one at a time 
+    (ranges and arrays are not materialized).
+    """
     for coordinates in abbreviation:
         if type(coordinates) is not tuple: 
             coordinates = (coordinates,)
         if type(coordinates[-1]) in [list,range,np.ndarray]:
-            list_of_coordinates += develop_abbreviation(coordinates[-1],
-                                              start = start + coordinates[:-1])
+            yield from iter_abbreviation(coordinates[-1],
+                                         start = start + coordinates[:-1])
         else:
-            list_of_coordinates += [start + coordinates]
-    return list_of_coordinates
+            yield start + coordinates
 
-def all_filepaths_ending_with(extension,folder='.'):
+def all_filepaths_ending_with(extension,folder='.',max_workers=8):
     """ 
     Explores the content of the folder and returns the complete filepaths
     (folder\filename.extension) to the files with the given format extension.
     """
-    filepaths,n = [],len(extension)
-    for branch,_,files in os.walk(folder):
-        for file in files:
-            if file[-n:]==extension:
-                filepaths.append(os.path.join(branch,file))
-    return filepaths    
+    return list(iter_filepaths_ending_with(extension,folder,max_workers))
+
+def iter_filepaths_ending_with(extension,folder='.',max_workers=8):
+    """ Same as all_filepaths_ending_with, in alphabetical order. """
+    for entry in scan_tree(folder,max_workers=max_workers):
+        if entry.name.endswith(extension):
+            yield entry.path
+            
+def list_folder(folder):
+    """ Sorted os.DirEntry of the folder, with the stat of the files cached. """
+    try:
+        with os.scandir(folder) as entries:
+            entries = sorted(entries,key=lambda entry:entry.name)
+    except OSError: # as os.walk, unreadable folders are skipped
+        return []
+    for entry in entries: # (in the thread listing the folder)
+        if not entry.is_dir():
+            try:
+                entry.stat()
+            except OSError: # e.g. broken symlink, or removed since
+                pass
+    return entries
+
+def scan_tree(folder='.',prefixes=None,max_workers=8):
+    """
+    Yields the os.DirEntry (name, path and cached stat) of the files below 
+    the folder, in alphabetical order. The subfolders are listed ahead in a 
+    pool of max_workers threads, which hides the latency of network drives.
+    prefixes: tuples of names, relative to the folder, e.g. 
+        [('SeqBEC','2023','07')]: only the files below (or equal to) one of
+        them are yielded, and only the folders leading to them are listed.
+    """
+    if prefixes is not None:
+        prefixes = set(prefixes)
+        ancestors = {p[:i] for p in prefixes for i in range(len(p))}
+        lengths = {len(p) for p in prefixes}
+    def wanted(path):
+        return prefixes is None or any(path[:n] in prefixes for n in lengths)
+    def scan(future,path):
+        entries,folders = future.result(),[]
+        for entry in entries:
+            entry_path = path + (entry.name,)
+            if entry.is_dir():
+                if entry.is_symlink(): # as os.walk, not followed
+                    continue
+                if wanted(entry_path) or entry_path in ancestors:
+                    folders.append((entry_path,pool.submit(list_folder,entry.path)))
+            elif wanted(entry_path):
+                yield entry
+        for entry_path,future in folders:
+            yield from scan(future,entry_path)
+    pool = ThreadPoolExecutor(max_workers)
+    try:
+        yield from scan(pool.submit(list_folder,folder),())
+    finally: # also when the generator is not run to the end
+        pool.shutdown(wait=False,cancel_futures=True)
+
+def scan_folders(folder='.',known={},max_workers=8):
+    """
+    Yields (folder,mtime,entries) for the folder and each folder below it,
+    depth first in alphabetical order, with the subfolders stat'ed and 
+    listed ahead in a pool of max_workers threads (as in scan_tree). 
+        known: {folder:(mtime,[subfolders])} from a previous scan; a folder
+               whose mtime did not change is not listed again (entries is 
+               None), and the scan goes on in its known subfolders
+    mtime is None (and nothing below is scanned) if the folder is missing.
+    """
+    def visit(path):
+        try:
+            mtime = os.stat(path).st_mtime_ns # before listing
+        except FileNotFoundError:
+            return None,None
+        if path in known and known[path][0]==mtime:
+            return mtime,None
+        return mtime,list_folder(path)
+    def scan(future,path):
+        mtime,entries = future.result()
+        yield path,mtime,entries
+        if mtime is None:
+            return
+        if entries is None:
+            subfolders = known[path][1]
+        else: # as os.walk, symlinks not followed
+            subfolders = [e.path for e in entries
+                          if e.is_dir() and not e.is_symlink()]
+        futures = [(p,pool.submit(visit,p)) for p in subfolders]
+        for p,future in futures:
+            yield from scan(future,p)
+    pool = ThreadPoolExecutor(max_workers)
+    try:
+        yield from scan(pool.submit(visit,folder),folder)
+    finally: # also when the generator is not run to the end
+        pool.shutdown(wait=False,cancel_futures=True)
 
 def folder_from_coordinates(root='',seq_name=None,year=None,month=None,
                             day=None,sequence=None):
@@ -61,28 +154,78 @@ def folder_from_coordinates(root='',seq_name=None,year=None,month=None,
     if sequence is not None: coordinates += (f'{sequence:04d}',)
     return os.path.join(*coordinates)
  
+folder_catalogs = {} # {folder:(mtime,{shot:filename},format of shot number)}
+
+def folder_catalog(folder):
+    """ 
+    Shot numbers and filenames of the .h5 files of a sequence folder, along
+    with the format of the shot numbers (zero-padded to the width of the 
+    largest one). The folder is listed once, then again only if modified.
+    """
+    mtime = os.stat(folder).st_mtime_ns
+    catalog = folder_catalogs.get(folder)
+    if catalog is None or catalog[0]!=mtime:
+        filenames = [x for x in os.listdir(folder) if x[-3:]=='.h5']
+        if len(filenames)<=1: fmt = '{:01d}'
+        else: fmt = '{:0'+str(int(np.floor(np.log10(len(filenames)-1))+1))+'d}'
+        shots = {}
+        for filename in filenames:
+            shot = filename[:-3].rsplit('_',1)[-1]
+            if shot.isdigit(): 
+                shots[int(shot)] = filename
+        catalog = folder_catalogs[folder] = (mtime,shots,fmt)
+    return catalog
+ 
 def filename_from_coordinates(root,seq_name,year,month,day,sequence,shot):
     """ Specific to the experimental implementation. """
     folder = folder_from_coordinates(root,seq_name,year,month,day,sequence)
+    _,shots,fmt = folder_catalog(folder)
+    if shot in shots:
+        return shots[shot]
     filename = f'{year}-{month:02d}-{day:02d}_{sequence:04d}_{seq_name}'
-    nb_h5_files = len([x for x in os.listdir(folder) if x[-3:]=='.h5'])
-    if nb_h5_files==1: fmt = '{:01d}'
-    else: fmt = '{:0'+str(int(np.floor(np.log10(nb_h5_files-1))+1))+'d}'
     return filename + f'_{fmt.format(shot)}.h5'
 
 def full_set_of_coordinates(coordinates):
     return type(coordinates) is tuple and len(coordinates)==6
 
 def filepaths_from_coordinates(root,*coordinates):
-    folder = folder_from_coordinates(root,*coordinates)
+    return list(iter_filepaths_from_coordinates(root,*coordinates))
+
+def iter_filepaths_from_coordinates(root,*coordinates):
+    folder = folder_from_coordinates(root,*coordinates[:5])
     if full_set_of_coordinates(coordinates):
-        filename = filename_from_coordinates(root,*coordinates)
-        return [os.path.join(folder,filename)]
+        yield os.path.join(folder,filename_from_coordinates(root,*coordinates))
     else:
-        return all_filepaths_ending_with('.h5',folder)
+        yield from iter_filepaths_ending_with('.h5',folder)
 
 def filepaths_from_abbreviation(abbreviation):
-    list_of_coordinates,filepaths = develop_abbreviation(abbreviation), []
-    for coordinates in list_of_coordinates:
-        filepaths += filepaths_from_coordinates(coordinates)
-    return filepaths
\ No newline at end of file
+    return list(iter_filepaths_from_abbreviation(abbreviation))
+
+def iter_filepaths_from_abbreviation(abbreviation):
+    """ 
+    Same as filepaths_from_abbreviation, yielding the filepaths one at a time,
+    so that loading can start as soon as the first one is resolved.
+    """
+    for coordinates in iter_abbreviation(abbreviation):
+        yield from iter_filepaths_from_coordinates(*coordinates)
+        
+def scan_abbreviation(abbreviation,extension='.h5',max_workers=8):
+    """
+    Yields the os.DirEntry of the files described by the abbreviation, with a 
+    single concurrent scan of each root, pruned to the folders (and files, for
+    full sets of coordinates) of the abbreviation. In alphabetical order.
+    """
+    prefixes = {} # {root:{tuples of names}}
+    for root,*coordinates in iter_abbreviation(abbreviation):
+        names = folder_from_coordinates('',*coordinates[:5]).split(os.sep)
+        names = tuple(name for name in names if name!='')
+        if full_set_of_coordinates(tuple(coordinates)):
+            try:
+                names += (filename_from_coordinates(root,*coordinates),)
+            except FileNotFoundError: # no such sequence folder
+                continue
+        prefixes.setdefault(root,set()).add(names)
+    for root,root_prefixes in prefixes.items():
+        for entry in scan_tree(root,root_prefixes,max_workers):
+            if entry.name.endswith(extension):
+                yield entry
\ No newline at end of file
@@ -8,6 +8,7 @@ import numpy as np
 from collections.abc import Iterable
 
 import sfloat
+from serialization_as_dict import encode_array
 
 from matplotlib import pyplot as plt
 from matplotlib.patches import Rectangle,FancyBboxPatch
@@ -39,10 +40,11 @@ def arrayify(*args,mask=None,sort=False,dtype=None):
     return L[0] if len(L)==1 else L
     # if (dtype is sfloat) or (sfloat in [type(x) for x in X]): X
     
-def encode(x):
+def encode(x,arrays=None,sidecar=None,name='array'):
     if isinstance(x,sfloat): return x.__dict__
-    if isinstance(x,dict): return {k:encode(v) for k,v in x.items()}
-    if isinstance(x,np.ndarray): return x.tolist()
+    if isinstance(x,dict): 
+        return {k:encode(v,arrays,sidecar,f'{name}.{k}') for k,v in x.items()}
+    if isinstance(x,np.ndarray): return encode_array(x,arrays,sidecar,name)
     if isinstance(x,np.int32): return int(x)
     else: return x
 
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026, @author: Simon
+
+Loading of many datafiles at once, in a pool of processes.
+"""
+import os
+import warnings
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor,wait,FIRST_COMPLETED
+from DataDict import DataDict
+from dataset_abbreviation import iter_filepaths_from_abbreviation
+
+def load_datadicts(source,max_workers=None,ordered=True,errors=None,
+                   window=None,**options):
+    """
+    Yields (filepath,DataDict) for each file of the source, read by a pool of
+    max_workers processes (default: number of CPUs).
+        source: list of filepaths, or abbreviation of the coordinates (see
+                dataset_abbreviation.develop_abbreviation)
+        ordered: yields in the order of the source if True, otherwise as 
+                 soon as each file is loaded
+        errors: dict filled with {filepath:exception} for the files that 
+                could not be loaded (which only raise a warning otherwise);
+                the other files are loaded anyway
+        window: maximum number of files being loaded or waiting to be
+                yielded (default: twice the number of processes), which 
+                bounds the memory used by the DataDicts not yielded yet
+        options: passed to DataDict (lazy loading is not possible here: 
+                 the files cannot stay open across processes)
+    N.B.: on Windows, must be called under "if __name__=='__main__':".
+    """
+    if options.get('lazy'):
+        raise ValueError('Lazy loading is not possible in a pool of processes')
+    if isinstance(source,str):
+        source = [source]
+    if all(isinstance(x,str) for x in source):
+        filepaths = iter(source)
+    else:
+        filepaths = iter_filepaths_from_abbreviation(source)
+    if window is None:
+        window = 2*(max_workers or os.cpu_count() or 1)
+    executor = ProcessPoolExecutor(max_workers)
+    futures = deque() # submitted, not yielded yet (in the order of source)
+    paths = {} # {future:path}
+    def submit(n):
+        for path in itertools.islice(filepaths,n):
+            future = executor.submit(_load,path,options)
+            futures.append(future)
+            paths[future] = path
+    try:
+        submit(window)
+        while futures:
+            if ordered:
+                done = [futures.popleft()]
+            else:
+                done = wait(futures,return_when=FIRST_COMPLETED).done
+                for future in done:
+                    futures.remove(future)
+            submit(len(done))
+            for future in done:
+                path = paths.pop(future)
+                try: # e.g. DataDict not picklable, or pool broken
+                    _,d,error = future.result()
+                except Exception as exception:
+                    d,error = None,exception
+                if error is None:
+                    yield path,d
+                elif errors is not None:
+                    errors[path] = error
+                else:
+                    warnings.warn(f'{path} could not be loaded: {error!r}')
+            done = future = d = None # not kept while waiting for the next
+    finally: # also if the generator is closed before the end
+        executor.shutdown(cancel_futures=True)
+    
+def _load(path,options):
+    try: 
+        return path,DataDict(path,**options),None
+    except Exception as error: 
+        return path,None,error
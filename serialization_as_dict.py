@@ -3,8 +3,11 @@
 Created on Mon Aug 28 16:51:20 2023, @author: Simon
 """
 
+import os
+import base64
 import numpy as np
 import h5py
+from pathlib import Path
 from fractions import Fraction
 from decimal import Decimal
 from mpmath import mpf,mpc
@@ -12,15 +15,45 @@ import copy
 
 # time, datetime, etc. objects ?
 
-def to_basic_types(dictionary):
+def encode_array(x,arrays=None,sidecar=None,name='array'):
+    """
+    arrays=None: nested lists (x.tolist()), readable but slow and bulky.
+    arrays='base64': {'__ndarray__':raw buffer in base64,'dtype','shape'}.
+    arrays='npy': {'__npy__':relative path} to a .npy file written in the
+                  sidecar folder (named after the array).
+    Object arrays have no raw buffer and are always converted to lists.
+    """
+    if arrays is None or x.dtype.hasobject:
+        return x.tolist()
+    elif arrays=='base64':
+        x = np.ascontiguousarray(x)
+        return {'__ndarray__':base64.b64encode(x.data).decode('ascii'),
+                'dtype':x.dtype.str,'shape':list(x.shape)}
+    elif arrays=='npy':
+        Path(sidecar).mkdir(parents=True,exist_ok=True)
+        filename = str(name).replace('/','_').replace('\\','_') + '.npy'
+        np.save(os.path.join(sidecar,filename),x)
+        return {'__npy__':os.path.basename(sidecar) + '/' + filename}
+    else: raise ValueError(f'Unknown array encoding {arrays}')
+    
+def decode_array(obj,folder='.'):
+    """ object_hook for json.load, inverse of encode_array. """
+    if '__ndarray__' in obj:
+        buffer = bytearray(base64.b64decode(obj['__ndarray__'])) # writable
+        return np.frombuffer(buffer,dtype=obj['dtype']).reshape(obj['shape'])
+    elif '__npy__' in obj:
+        return np.load(os.path.join(folder,obj['__npy__']))
+    return obj
+
+def to_basic_types(dictionary,arrays=None,sidecar=None,root=''):
     basic_dict = {}
     for k,v in dictionary.items():
         if isinstance(v,dict):
-            basic_dict[k] = to_basic_types(v)
+            basic_dict[k] = to_basic_types(v,arrays,sidecar,f'{root}{k}.')
         elif isinstance(v,(set,tuple)):
             basic_dict[k] = list(v)
         elif isinstance(v,np.ndarray):
-            basic_dict[k] = v.tolist()
+            basic_dict[k] = encode_array(v,arrays,sidecar,f'{root}{k}')
         elif isinstance(v,np.integer):
             basic_dict[k] = int(v)
         elif isinstance(v,np.floating):
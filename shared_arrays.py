@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026, @author: Simon
+
+Transfer of the arrays of a DataDict to worker processes (multiprocessing)
+through shared memory, instead of pickling and copying them for each worker.
+    >>> with SharedArrays(d) as handle:  # in the main process
+    ...     results = pool.map(analysis,[handle]*n)
+    >>> def analysis(handle):             # in the workers
+    ...     d = attach(handle) # same DataDict, arrays viewing shared memory
+The shared memory blocks are freed when leaving the "with" block.
+"""
+import numpy as np
+from multiprocessing import shared_memory
+from DataDict import DataDict
+
+class SharedArray:
+    """ 
+    Picklable reference to an array stored in a shared memory block (and, 
+    for a masked array, to its mask stored in a second block). 
+    """
+    
+    def __init__(self,name,shape,dtype,mask=None,fill_value=None):
+        self.name,self.shape,self.dtype = name,shape,dtype
+        self.mask,self.fill_value = mask,fill_value
+        
+    def __repr__(self):
+        masked = '' if self.mask is None else ' masked'
+        return f'<SharedArray {self.name} {self.shape} {self.dtype}{masked}>'
+    
+class SharedArrays:
+    """
+    Copies the arrays of the DataDict (at least min_bytes large) to shared
+    memory blocks, owned by this object until close(). The handle (a DataDict
+    in which these arrays are replaced by SharedArray references) is all 
+    that needs to be sent to the workers.
+    """
+    
+    def __init__(self,d,min_bytes=1):
+        self.blocks = []
+        self.handle = map_leaves(d,lambda v:self.__share__(v,min_bytes))
+        
+    def __share__(self,v,min_bytes):
+        if not isinstance(v,np.ndarray) or v.dtype.hasobject \
+           or v.nbytes<max(min_bytes,1):
+            return v
+        if isinstance(v,np.ma.MaskedArray):
+            res = self.__share__(v.data,min_bytes)
+            if v.mask is not np.ma.nomask:
+                res.mask = self.__share__(v.mask,1)
+            res.fill_value = v.fill_value
+            return res
+        block = shared_memory.SharedMemory(create=True,size=v.nbytes)
+        self.blocks.append(block)
+        np.ndarray(v.shape,dtype=v.dtype,buffer=block.buf)[...] = v
+        return SharedArray(block.name,v.shape,v.dtype)
+    
+    def __enter__(self):
+        return self.handle
+    
+    def __exit__(self,*exc_info):
+        self.close()
+        
+    def close(self):
+        while self.blocks:
+            block = self.blocks.pop()
+            block.close()
+            block.unlink()
+            
+def attach(handle):
+    """
+    DataDict rebuilt from the handle, with views of the shared memory blocks
+    as arrays (each block kept open as long as its array, or any view of it,
+    exists).
+    """
+    def view(v):
+        if not isinstance(v,SharedArray):
+            return v
+        array = np.asarray(BlockView(open_block(v.name),v.shape,v.dtype))
+        if v.fill_value is None:
+            return array
+        mask = np.ma.nomask if v.mask is None else view(v.mask)
+        return np.ma.MaskedArray(array,mask=mask,fill_value=v.fill_value,
+                                 copy=False)
+    return map_leaves(handle,view)
+
+class BlockView:
+    """ 
+    Base of the array viewing a shared memory block: the arrays and views 
+    built on it hold a reference to it, hence to the block. 
+    """
+    
+    def __init__(self,block,shape,dtype):
+        self.block = block
+        array = np.ndarray(shape,dtype=dtype,buffer=block.buf)
+        self.__array_interface__ = array.__array_interface__
+
+def open_block(name):
+    # the owner alone is in charge of unlinking the block (before python 
+    # 3.13, processes of the pool share the resource tracker of the owner)
+    try:
+        return shared_memory.SharedMemory(name=name,track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+    
+def map_leaves(d,function):
+    """ Copy of the tree structure, with function applied to the values. """
+    res = DataDict()
+    for k,v in d.items():
+        res[k] = map_leaves(v,function) if isinstance(v,DataDict) \
+                 else function(v)
+    return res
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026, @author: Simon
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+from dataset_abbreviation import develop_abbreviation, folder_from_coordinates, \
+                                 scan_folders
+
+coordinate_names = ['seq_name','year','month','day','sequence','shot']
+
+class ShotIndex:
+    """
+Local SQLite catalog of the .h5 shot files of the data tree
+(root/seq_name/year/month/day/sequence/shot.h5), so that abbreviations
+resolve to filepaths with indexed queries instead of walks of the tree.
+The catalog is refreshed incrementally: every folder is stat'ed, but only
+the folders whose modification time changed since the last refresh are
+listed again, ahead in a pool of max_workers threads. (A file rewritten in place does not change the mtime of its
+folder, and is not noticed.)
+    >>> index = ShotIndex()
+    >>> filepaths = index.filepaths_from_abbreviation([('data','SeqBEC',2023,7)])
+    """
+
+    def __init__(self,database=None,max_workers=8):
+        if database is None:
+            folder = os.path.join(os.path.expanduser('~'),'.cache','ShotIndex')
+            Path(folder).mkdir(parents=True,exist_ok=True)
+            database = os.path.join(folder,'shot_index.sqlite')
+        self.database,self.max_workers = database,max_workers
+        self.connection = sqlite3.connect(database)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS folders (
+                path TEXT PRIMARY KEY, parent TEXT, mtime INTEGER);
+            CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent);
+            CREATE TABLE IF NOT EXISTS shots (
+                root TEXT, seq_name TEXT, year INTEGER, month INTEGER,
+                day INTEGER, sequence INTEGER, shot INTEGER,
+                path TEXT PRIMARY KEY, folder TEXT, size INTEGER, mtime INTEGER);
+            CREATE INDEX IF NOT EXISTS shots_coordinates ON shots (
+                root, seq_name, year, month, day, sequence, shot);
+            CREATE INDEX IF NOT EXISTS shots_folder ON shots (folder);
+            """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exception):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def refresh(self,root='',*coordinates):
+        """ Updates the catalog below folder_from_coordinates(root,*coordinates). """
+        root = os.path.abspath(root)
+        top = os.path.abspath(folder_from_coordinates(root,*coordinates[:5]))
+        known,prefix = {},top + os.sep # {folder:(mtime,[subfolders])}
+        for path,parent,mtime in self.connection.execute(
+                'SELECT path,parent,mtime FROM folders WHERE path=? '
+                'OR substr(path,1,?)=?',(top,len(prefix),prefix)):
+            known.setdefault(path,[None,[]])[0] = mtime
+            known.setdefault(parent,[None,[]])[1].append(path)
+        with self.connection:
+            for folder,mtime,entries in scan_folders(top,known,self.max_workers):
+                if mtime is None:
+                    self.__forget__(folder)
+                    continue
+                if entries is None: # unchanged
+                    continue
+                subfolders,shots = [],[]
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subfolders.append(entry.path)
+                    elif entry.name.endswith('.h5'):
+                        try:
+                            stat = entry.stat() # (cached by scan_folders)
+                        except OSError: # removed since listed
+                            continue
+                        shots.append((root,*self.__coordinates__(root,entry.path),
+                              entry.path,folder,stat.st_size,stat.st_mtime_ns))
+                children = known.get(folder,(None,[]))[1]
+                for child in set(children)-set(subfolders):
+                    self.__forget__(child)
+                self.connection.execute('DELETE FROM shots WHERE folder=?',(folder,))
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO shots VALUES (?,?,?,?,?,?,?,?,?,?,?)',shots)
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO folders VALUES (?,?,?)',
+                    (folder,os.path.dirname(folder),mtime))
+
+    def __forget__(self,folder):
+        """ Removes the folder and everything below it from the catalog. """
+        prefix = folder + os.sep
+        for table,column in [('folders','path'),('shots','folder')]:
+            self.connection.execute(f'DELETE FROM {table} WHERE {column}=? '
+                    f'OR substr({column},1,?)=?',(folder,len(prefix),prefix))
+
+    @staticmethod
+    def __coordinates__(root,filepath):
+        """ (seq_name,year,month,day,sequence,shot), None where missing. """
+        folders = os.path.relpath(os.path.dirname(filepath),root).split(os.sep)
+        folders = [f for f in folders if f!='.'][:5]
+        folders += [None]*(5-len(folders))
+        coordinates = [folders[0]]
+        for f in folders[1:]:
+            coordinates.append(int(f) if f is not None and f.isdigit() else None)
+        shot = os.path.basename(filepath)[:-3].rsplit('_',1)[-1]
+        coordinates.append(int(shot) if shot.isdigit() else None)
+        return coordinates
+
+    def filepaths_from_coordinates(self,root,*coordinates,refresh=True):
+        if refresh:
+            self.refresh(root,*coordinates)
+        conditions = ''.join(f' AND {name}=?' for name,_ in
+                             zip(coordinate_names,coordinates))
+        rows = self.connection.execute(
+            'SELECT path FROM shots WHERE root=?' + conditions + ' ORDER BY '
+            'seq_name,year,month,day,sequence,shot,path',
+            (os.path.abspath(root),*coordinates))
+        return [os.path.join(root,os.path.relpath(path,os.path.abspath(root)))
+                for path, in rows]
+
+    def filepaths_from_abbreviation(self,abbreviation,refresh=True):
+        filepaths = []
+        for coordinates in develop_abbreviation(abbreviation):
+            filepaths += self.filepaths_from_coordinates(*coordinates,
+                                                         refresh=refresh)
+        return filepaths
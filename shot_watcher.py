@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 2026, @author: Simon
+"""
+
+import os
+import time
+import warnings
+from DataDict import DataDict
+from dataset_abbreviation import folder_from_coordinates, scan_folders
+
+def shot_number(filename):
+    """ 'yyyy-mm-dd_ssss_seq_name_12.h5' -> 12, None if not numbered. """
+    shot = os.path.splitext(filename)[0].rsplit('_',1)[-1]
+    return int(shot) if shot.isdigit() else None
+
+class ShotWatcher:
+    """
+Watches the folders below folder_from_coordinates(root,*coordinates) during
+a running experiment, and yields the shot files once they are complete,
+i.e. once their size and modification time have not changed for settle
+seconds. A folder is listed again only when its modification time changes
+(the folders are stat'ed and listed in a pool of max_workers threads);
+only the files still being written are stat'ed at every poll. Per folder,
+the highest shot number yielded so far is kept as a high-water mark: files
+below it are not considered again (a file that could not be loaded is not
+yielded, and is tried again when its folder changes).
+    >>> watcher = ShotWatcher('data','SeqBEC',2023,7,5)
+    >>> for filepath,d in watcher.datadicts(select=['results']):
+    >>>     analyse(d)
+    """
+
+    def __init__(self,root='',*coordinates,extension='.h5',settle=2.,
+                 interval=1.,existing=True,max_workers=8):
+        self.top = folder_from_coordinates(root,*coordinates[:5])
+        self.extension,self.settle,self.interval = extension,settle,interval
+        self.max_workers = max_workers
+        self.folders = {} # {folder:(mtime,[subfolders])}
+        self.marks = {} # {folder:highest shot number yielded}
+        self.pending = {} # {filepath:(folder,shot,size,mtime,since)}
+        if not existing:
+            self.poll()
+            for filepath in self.pending:
+                self.__mark__(filepath)
+            self.pending = {}
+
+    def poll(self,mark=True):
+        """ 
+        One pass over the folders: returns the newly completed files (mark: 
+        whether to advance the high-water marks past them already). 
+        """
+        for folder,mtime,entries in scan_folders(self.top,self.folders,
+                                                 self.max_workers):
+            if mtime is None: # not created yet, or removed
+                self.folders.pop(folder,None)
+                continue
+            if entries is None: # unchanged
+                continue
+            subfolders,highest = [],self.marks.get(folder,-1)
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subfolders.append(entry.path)
+                elif (entry.name.endswith(self.extension)
+                      and entry.path not in self.pending):
+                    shot = shot_number(entry.name)
+                    if shot is not None and shot>highest:
+                        self.pending[entry.path] = (folder,shot,None,None,None)
+            self.folders[folder] = (mtime,subfolders)
+        completed = self.__completed__()
+        if mark:
+            for filepath in completed:
+                self.__mark__(filepath)
+        return completed
+    
+    def __mark__(self,filepath):
+        folder,filename = os.path.split(filepath)
+        self.marks[folder] = max(self.marks.get(folder,-1),shot_number(filename))
+
+    def __completed__(self):
+        completed,now = [],time.monotonic()
+        for filepath,(folder,shot,size,mtime,since) in list(self.pending.items()):
+            try:
+                stat = os.stat(filepath)
+            except FileNotFoundError:
+                del self.pending[filepath]
+                continue
+            if (stat.st_size,stat.st_mtime)!=(size,mtime): # still being written
+                self.pending[filepath] = (folder,shot,stat.st_size,
+                                          stat.st_mtime,now)
+            if (now-self.pending[filepath][4]>=self.settle
+                or time.time()-stat.st_mtime>=self.settle):
+                del self.pending[filepath]
+                completed.append((folder,shot,filepath))
+        return [filepath for *_,filepath in sorted(completed)]
+
+    def __iter__(self):
+        return self.watch()
+
+    def watch(self,timeout=None):
+        """
+        Yields the completed files as they land, until no new file has been
+        completed for timeout seconds (forever if None).
+        """
+        for filepath in self.__watch__(timeout):
+            self.__mark__(filepath)
+            yield filepath
+            
+    def __watch__(self,timeout):
+        last = time.monotonic()
+        while timeout is None or time.monotonic()-last<timeout:
+            for filepath in self.poll(mark=False):
+                yield filepath
+                last = time.monotonic()
+            time.sleep(self.interval)
+
+    def datadicts(self,timeout=None,errors=None,**options):
+        """ 
+        Yields (filepath,DataDict(filepath,**options)) as the files land. 
+        errors: dict filled with {filepath:exception} for the files that 
+                could not be loaded (which only raise a warning otherwise).
+        """
+        for filepath in self.__watch__(timeout):
+            try:
+                d = DataDict(filepath,**options)
+            except Exception as error:
+                if errors is not None:
+                    errors[filepath] = error
+                else:
+                    warnings.warn(f'{filepath} could not be loaded: {error!r}')
+                continue
+            self.__mark__(filepath)
+            yield filepath,d
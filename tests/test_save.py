@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Saving of DataDicts to .h5 files, in particular back to the file they were
+loaded from (only the changes, or the whole tree with full=True).
+"""
+
+import os
+import sys
+import numpy as np
+import pytest
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DataDict import DataDict
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path/'shot.h5')
+    d = DataDict({'globals':{'attrs':{'power':1.5,'name':'dimple'}},
+                  'images':{'absorption':np.arange(12.).reshape(3,4),
+                            'background':np.zeros((3,4))}})
+    d.save(path)
+    return path
+
+def test_roundtrip(source,tmp_path):
+    d = DataDict(source)
+    d.save(str(tmp_path/'copy.h5'))
+    e = DataDict(str(tmp_path/'copy.h5'))
+    assert e.globals.attrs.power==1.5 and e.globals.attrs.name=='dimple'
+    assert np.array_equal(e.images.absorption.data,d.images.absorption.data)
+
+def test_save_changes(source):
+    d = DataDict(source)
+    d.globals.attrs.power = 2.
+    d.images.absorption.data = np.ones((3,4))
+    del d.images['background']
+    d.results = {'attrs':{'N':1E5}}
+    d.save(source)
+    e = DataDict(source)
+    assert e.globals.attrs.power==2. and e.globals.attrs.name=='dimple'
+    assert np.array_equal(e.images.absorption.data,np.ones((3,4)))
+    assert 'background' not in e.images
+    assert e.results.attrs.N==1E5
+    
+def test_in_place_edit_needs_full(source):
+    d = DataDict(source)
+    d.images.absorption.data[0,0] = -1 # not tracked
+    d.save(source)
+    assert DataDict(source).images.absorption.data[0,0]==0
+    d.save(source,full=True)
+    e = DataDict(source)
+    assert e.images.absorption.data[0,0]==-1
+    assert np.array_equal(e.images.background.data,np.zeros((3,4)))
+    assert e.globals.attrs.name=='dimple'
+    
+def test_full_save_with_memmap(source):
+    d = DataDict(source,memmap=True)
+    d.globals.attrs.power = 3.
+    d.save(source,full=True)
+    e = DataDict(source)
+    assert e.globals.attrs.power==3.
+    assert np.array_equal(e.images.absorption.data,np.arange(12.).reshape(3,4))
+    
+def test_lazy_source_must_be_closed(source):
+    d = DataDict(source,lazy=True)
+    with pytest.raises(Exception):
+        d.save(source)
+    d.close()